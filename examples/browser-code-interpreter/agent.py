@@ -6,24 +6,34 @@ This agent demonstrates how to use:
 - Code Interpreter for Python execution
 """
 
-import json
 import logging
 from typing import Any
 
-logging.basicConfig(level=logging.INFO)
+import orjson
+
+# Configure logging once - avoid re-configuring on warm starts
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _json(body: Any) -> str:
+    """Serialize a response body with orjson (API Gateway wants a str body)."""
+    return orjson.dumps(body).decode()
+
+
 def handler(event: dict, context: Any) -> dict:
     """AWS Lambda handler for AgentCore Runtime."""
-    logger.info(f"Received event: {json.dumps(event)}")
+    # Lazy formatting - skip serializing the event when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", _json(event))
 
     # This is a placeholder - real implementation would integrate with
     # MCP protocol and use Browser/CodeInterpreter resources
 
     return {
         "statusCode": 200,
-        "body": json.dumps({
+        "body": _json({
             "message": "Research agent ready",
             "capabilities": ["browser", "code_interpreter"]
         })
@@ -8,141 +8,235 @@ This agent demonstrates integration with multiple AgentCore resources:
 - Gateway for external API tools
 """
 
-import json
+import asyncio
 import logging
 from typing import Any
 
+import orjson
 from mcp.server import Server
 from mcp.types import (
     Tool,
     TextContent,
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging once - avoid re-configuring on warm starts
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create MCP server
 server = Server("full-stack-agent")
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools for the agent."""
-    return [
-        Tool(
-            name="search_memory",
-            description="Search conversation history using semantic search",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "The search query"
-                    },
-                    "session_id": {
-                        "type": "string",
-                        "description": "Optional session ID to scope search"
-                    }
-                },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="browse_url",
-            description="Browse a URL and extract content",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "url": {
-                        "type": "string",
-                        "description": "The URL to browse"
-                    }
-                },
-                "required": ["url"]
-            }
-        ),
-        Tool(
-            name="execute_code",
-            description="Execute Python code in a sandboxed environment",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "Python code to execute"
-                    }
+def _json(body: Any) -> str:
+    """Serialize a response body with orjson (API Gateway wants a str body)."""
+    return orjson.dumps(body).decode()
+
+
+# Tool definitions are static - build them once at module load instead of
+# reallocating the Tool objects and nested schema dicts on every MCP call
+_TOOLS: list[Tool] = [
+    Tool(
+        name="search_memory",
+        description="Search conversation history using semantic search",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The search query"
                 },
-                "required": ["code"]
-            }
-        ),
-        Tool(
-            name="get_weather",
-            description="Get current weather for a location",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "location": {
-                        "type": "string",
-                        "description": "City name or coordinates"
+                "session_id": {
+                    "type": "string",
+                    "description": "Optional session ID to scope search"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="browse_url",
+        description="Browse a URL and extract content",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {
+                    "type": "string",
+                    "description": "The URL to browse"
+                }
+            },
+            "required": ["url"]
+        }
+    ),
+    Tool(
+        name="execute_code",
+        description="Execute Python code in a sandboxed environment",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "Python code to execute"
+                }
+            },
+            "required": ["code"]
+        }
+    ),
+    Tool(
+        name="batch_execute",
+        description="Run multiple independent tool calls concurrently and return all results",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "description": "Tool calls to run, each with a name and arguments",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "description": "Tool name to invoke"
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for the tool"
+                            }
+                        },
+                        "required": ["name"]
                     }
                 },
-                "required": ["location"]
-            }
-        )
-    ]
-
+                "maxConcurrent": {
+                    "type": "integer",
+                    "description": "Maximum tool calls in flight at once (default 5)"
+                }
+            },
+            "required": ["operations"]
+        }
+    ),
+    Tool(
+        name="get_weather",
+        description="Get current weather for a location",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "location": {
+                    "type": "string",
+                    "description": "City name or coordinates"
+                }
+            },
+            "required": ["location"]
+        }
+    )
+]
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls."""
-    logger.info(f"Tool called: {name} with arguments: {arguments}")
 
-    if name == "search_memory":
-        # In a real implementation, this would call the Memory API
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools for the agent."""
+    return _TOOLS
+
+
+async def _search_memory(arguments: dict[str, Any]) -> list[TextContent]:
+    # In a real implementation, this would call the Memory API
+    return [TextContent(
+        type="text",
+        text=f"Searching memory for: {arguments.get('query')}"
+    )]
+
+
+async def _browse_url(arguments: dict[str, Any]) -> list[TextContent]:
+    # In a real implementation, this would use the Browser resource
+    return [TextContent(
+        type="text",
+        text=f"Browsing URL: {arguments.get('url')}"
+    )]
+
+
+async def _execute_code(arguments: dict[str, Any]) -> list[TextContent]:
+    # In a real implementation, this would use the CodeInterpreter
+    return [TextContent(
+        type="text",
+        text="Executing code in sandbox..."
+    )]
+
+
+async def _get_weather(arguments: dict[str, Any]) -> list[TextContent]:
+    # This calls the Gateway target
+    return [TextContent(
+        type="text",
+        text=f"Getting weather for: {arguments.get('location')}"
+    )]
+
+
+async def _batch_execute(arguments: dict[str, Any]) -> list[TextContent]:
+    # Fan independent tool calls out with asyncio.gather so a turn of N
+    # IO-bound calls costs roughly the slowest one instead of the sum
+    operations = arguments.get("operations", [])
+    semaphore = asyncio.Semaphore(arguments.get("maxConcurrent", 5))
+
+    async def run_one(operation: dict[str, Any]):
+        async with semaphore:
+            results = await _dispatch(
+                operation.get("name", ""),
+                operation.get("arguments", {}),
+            )
+            return [content.text for content in results]
+
+    results = await asyncio.gather(
+        *(run_one(operation) for operation in operations),
+        return_exceptions=True,
+    )
+
+    payload = [str(r) if isinstance(r, Exception) else r for r in results]
+    return [TextContent(
+        type="text",
+        text=_json(payload)
+    )]
+
+
+# O(1) dispatch instead of walking an if/elif chain per call; adding a
+# tool is one entry here plus its definition in _TOOLS
+_HANDLERS: dict[str, Any] = {
+    "search_memory": _search_memory,
+    "browse_url": _browse_url,
+    "execute_code": _execute_code,
+    "get_weather": _get_weather,
+    "batch_execute": _batch_execute,
+}
+
+
+async def _dispatch(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Route a tool call to its handler."""
+    tool_handler = _HANDLERS.get(name)
+    if tool_handler is None:
         return [TextContent(
             type="text",
-            text=f"Searching memory for: {arguments.get('query')}"
+            text=f"Unknown tool: {name}"
         )]
 
-    elif name == "browse_url":
-        # In a real implementation, this would use the Browser resource
-        return [TextContent(
-            type="text",
-            text=f"Browsing URL: {arguments.get('url')}"
-        )]
+    return await tool_handler(arguments)
 
-    elif name == "execute_code":
-        # In a real implementation, this would use the CodeInterpreter
-        return [TextContent(
-            type="text",
-            text=f"Executing code in sandbox..."
-        )]
 
-    elif name == "get_weather":
-        # This calls the Gateway target
-        return [TextContent(
-            type="text",
-            text=f"Getting weather for: {arguments.get('location')}"
-        )]
+@server.call_tool()
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle tool calls."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Tool called: %s with arguments: %s", name, arguments)
 
-    else:
-        return [TextContent(
-            type="text",
-            text=f"Unknown tool: {name}"
-        )]
+    return await _dispatch(name, arguments)
 
 
 def handler(event: dict, context: Any) -> dict:
     """AWS Lambda handler for AgentCore Runtime."""
-    import asyncio
-
-    logger.info(f"Received event: {json.dumps(event)}")
+    # Lazy formatting - skip serializing the event when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", _json(event))
 
     # Process the MCP request
     # This is a simplified handler - real implementation would use MCP protocol
 
     return {
         "statusCode": 200,
-        "body": json.dumps({"message": "Agent processed request"})
+        "body": _json({"message": "Agent processed request"})
     }
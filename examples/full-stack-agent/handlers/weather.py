@@ -1,8 +1,23 @@
 """Weather API handler for Gateway integration."""
 
-import json
 from typing import Any
 
+import msgspec
+
+
+class WeatherResponse(msgspec.Struct):
+    """Typed weather response encoded straight to JSON bytes."""
+
+    location: str
+    temperature: int
+    unit: str
+    conditions: str
+    humidity: int
+
+
+# One encoder instance, reused across invocations
+_encoder = msgspec.json.Encoder()
+
 
 def handler(event: dict, context: Any) -> dict:
     """Handle weather API requests."""
@@ -10,16 +25,18 @@ def handler(event: dict, context: Any) -> dict:
 
     location = event.get("queryStringParameters", {}).get("location", "Unknown")
 
+    body = WeatherResponse(
+        location=location,
+        temperature=72,
+        unit="fahrenheit",
+        conditions="Sunny",
+        humidity=45,
+    )
+
     return {
         "statusCode": 200,
         "headers": {
             "Content-Type": "application/json"
         },
-        "body": json.dumps({
-            "location": location,
-            "temperature": 72,
-            "unit": "fahrenheit",
-            "conditions": "Sunny",
-            "humidity": 45
-        })
+        "body": _encoder.encode(body).decode()
     }
@@ -11,21 +11,76 @@ from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 from bedrock_agentcore import BedrockAgentCoreApp
+import ast
 import os
-import yaml
+import re
+from datetime import datetime
+from functools import lru_cache
 
 
 # Initialize the Bedrock AgentCore app
 app = BedrockAgentCoreApp()
+
+# Interned once at import; the `or` form also skips .get's default-arg
+# handling on the common path where a prompt is present
+_DEFAULT_PROMPT = "Hello!"
+
 app_name = "myAgent"
 
 # Define example tools
 def get_current_time() -> str:
     """Get the current date and time."""
-    from datetime import datetime
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+# Compiled once so validation is a single C-level scan per call instead of
+# a Python loop over every character
+_SAFE_EXPR = re.compile(r"^[0-9+\-*/(). ]+$")
+
+# Only plain arithmetic may appear in an expression - no names, calls,
+# attributes, or subscripts
+_ALLOWED_AST_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+
+# Exponents must be plain (optionally signed) constants no larger than
+# this, so chained or huge powers like 9**9**9 can't stall the process
+# building an enormous integer
+_MAX_EXPONENT = 1000
+
+
+@lru_cache(maxsize=256)
+def _compile_expression(expression: str):
+    """Whitelist-check and compile an arithmetic expression, cached per expression."""
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_AST_NODES):
+            raise ValueError(f"unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError("only numeric constants are allowed")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            exponent = node.right
+            if isinstance(exponent, ast.UnaryOp):
+                exponent = exponent.operand
+            if not isinstance(exponent, ast.Constant):
+                raise ValueError("exponent too complex")
+            if abs(exponent.value) > _MAX_EXPONENT:
+                raise ValueError("exponent too large")
+    return compile(tree, "<calc>", "eval")
+
+
 def calculate(expression: str) -> str:
     """
     Safely evaluate a mathematical expression.
@@ -38,10 +93,11 @@ def calculate(expression: str) -> str:
     """
     try:
         # Only allow safe mathematical operations
-        allowed_chars = set('0123456789+-*/(). ')
-        if not all(c in allowed_chars for c in expression):
+        if not _SAFE_EXPR.match(expression):
             return "Error: Invalid characters in expression"
-        result = eval(expression, {"__builtins__": {}}, {})
+        # AST whitelist plus compile cache - repeated expressions skip
+        # the parse/compile pipeline entirely
+        result = eval(_compile_expression(expression), {"__builtins__": {}}, {})
         return str(result)
     except Exception as e:
         return f"Error: {str(e)}"
@@ -116,7 +172,7 @@ async def run_agent_streaming(query: str, user_id: str, session_id: str):
 @app.entrypoint
 async def invoke_agent(payload, context):
     """Main entrypoint for the agent - handles incoming requests."""
-    prompt = payload.get("prompt", "Hello!")
+    prompt = payload.get("prompt") or _DEFAULT_PROMPT
     user_id = payload.get("user_id", "default_user")
     session_id = context.session_id
 
@@ -16,6 +16,10 @@ os.environ["BYPASS_TOOL_CONSENT"] = "true"
 # Initialize the Bedrock AgentCore app
 app = BedrockAgentCoreApp()
 
+# Interned once at import; the `or` form also skips .get's default-arg
+# handling on the common path where a prompt is present
+_DEFAULT_PROMPT = "Hello!"
+
 
 # Define custom tools using the @tool decorator
 @tool
@@ -76,6 +80,21 @@ Be concise and helpful in your responses. Use tools when appropriate.""",
 )
 
 
+def _extract_text(message):
+    """Extract the response text from an agent result message.
+
+    Hot path for every response, so the shape checks use type() rather
+    than isinstance.
+    """
+    if type(message) is dict and "content" in message:
+        content = message["content"]
+        if type(content) is list and content:
+            first = content[0]
+            if type(first) is dict:
+                return first.get("text", str(content))
+    return message
+
+
 @app.entrypoint
 def invoke(payload, context):
     """
@@ -88,21 +107,25 @@ def invoke(payload, context):
     Returns:
         The agent's response
     """
-    prompt = payload.get("prompt", "Hello!")
+    prompt = payload.get("prompt") or _DEFAULT_PROMPT
 
     # Invoke the agent with the user's prompt
     result = agent(prompt)
 
     # Extract the response text
-    response_text = result.message
-    if isinstance(response_text, dict) and "content" in response_text:
-        # Handle structured response
-        content = response_text["content"]
-        if isinstance(content, list) and len(content) > 0:
-            response_text = content[0].get("text", str(content))
+    response_text = _extract_text(result.message)
 
     return {"result": response_text}
 
 
+# Opt-in warm-up: pay the first-invocation costs (Bedrock TLS, model
+# handshake) during container init instead of on the first user request
+if os.getenv("AGENTCORE_WARMUP") == "1":
+    try:
+        agent("warmup")
+    except Exception as e:
+        print(f"Agent warm-up failed (non-fatal): {e}")
+
+
 if __name__ == "__main__":
     app.run()
@@ -7,6 +7,8 @@ long-term knowledge retention.
 """
 
 import os
+from collections import OrderedDict
+
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from bedrock_agentcore.memory import MemoryClient
 from strands import Agent, tool
@@ -23,6 +25,10 @@ os.environ["BYPASS_TOOL_CONSENT"] = "true"
 # Initialize the Bedrock AgentCore app
 app = BedrockAgentCoreApp()
 
+# Interned once at import; the `or` form also skips .get's default-arg
+# handling on the common path where a prompt is present
+_DEFAULT_PROMPT = "Hello!"
+
 # Connect to AgentCore Memory service
 # MEMORY_ID should be set to the deployed Memory resource ID
 MEMORY_ID = os.getenv("MEMORY_ID")
@@ -33,14 +39,69 @@ if MEMORY_ID:
     memory_client = MemoryClient(region_name=MEMORY_REGION)
     print(f"Memory client initialized with ID: {MEMORY_ID}")
 
+    # Optional warm-up: one lightweight call during container init forces
+    # endpoint discovery and the TLS handshake off the first user request
+    if os.getenv("MEMORY_WARMUP") == "1":
+        try:
+            memory_client.list_events(
+                memory_id=MEMORY_ID,
+                actor_id="warmup",
+                session_id="warmup",
+                max_results=1,
+            )
+        except Exception as e:
+            print(f"Memory warm-up call failed (non-fatal): {e}")
+
+# Response cache - repeated prompts within the same user/session skip the
+# model call. Scoped by (user, session) so cached answers never cross
+# conversations. Set RESPONSE_CACHE_SIZE=0 to disable.
+_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "128"))
+_response_cache: OrderedDict = OrderedDict()
+
+
+def _cache_get(key):
+    """Return a cached response and refresh its LRU position, or None."""
+    response = _response_cache.get(key)
+    if response is not None:
+        _response_cache.move_to_end(key)
+    return response
+
+
+def _cache_put(key, response):
+    """Cache a response, dropping the least recently used entry when full."""
+    if not _CACHE_SIZE:
+        return
+    _response_cache[key] = response
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > _CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+def _format_history_message(msg):
+    """Format a stored message as 'role: text', or None if it has no text."""
+    content = msg.get("content", {})
+    # type() check instead of isinstance - this runs for every stored message
+    text = content.get("text", "") if type(content) is dict else str(content)
+    if not text:
+        return None
+    return f"{msg.get('role', 'unknown')}: {text}"
+
 
 class MemoryHook(HookProvider):
     """
     Hook provider that automatically handles memory operations:
     - Loads previous conversation history when agent initializes
-    - Saves each message after it's processed
+    - Buffers messages as they arrive and writes them in batches
     """
 
+    # Flush early once this many messages are buffered
+    FLUSH_THRESHOLD = 16
+
+    def __init__(self):
+        self._pending: list[tuple[str, str]] = []
+        self._session_id = None
+        self._user_id = None
+
     def on_agent_initialized(self, event: AgentInitializedEvent):
         """
         Called when the agent starts - loads conversation history from memory.
@@ -61,27 +122,30 @@ class MemoryHook(HookProvider):
             )
 
             if turns:
-                # Format conversation history and add to system prompt
-                history_lines = []
-                for turn in turns:
-                    for msg in turn:
-                        role = msg.get("role", "unknown")
-                        content = msg.get("content", {})
-                        text = content.get("text", "") if isinstance(content, dict) else str(content)
-                        if text:
-                            history_lines.append(f"{role}: {text}")
-
-                if history_lines:
-                    context = "\n".join(history_lines)
+                # Flatten all turns in a single pass; the list (rather
+                # than a generator) keeps an exact message count, since
+                # stored texts may themselves contain newlines
+                lines = [
+                    line
+                    for turn in turns
+                    for line in (_format_history_message(msg) for msg in turn)
+                    if line
+                ]
+
+                if lines:
+                    context = "\n".join(lines)
                     event.agent.system_prompt += f"\n\nPrevious conversation:\n{context}"
-                    print(f"Loaded {len(history_lines)} messages from memory")
+                    print(f"Loaded {len(lines)} messages from memory")
 
         except Exception as e:
             print(f"Error loading memory: {e}")
 
     def on_message_added(self, event: MessageAddedEvent):
         """
-        Called after each message - saves it to memory.
+        Called after each message - buffers it for a batched memory write.
+
+        Buffering avoids one create_event round-trip per message; the
+        whole turn is written in a single call from flush().
         """
         if not memory_client or not MEMORY_ID:
             return
@@ -90,6 +154,12 @@ class MemoryHook(HookProvider):
             session_id = event.agent.state.get("session_id", "default")
             user_id = event.agent.state.get("user_id", "default_user")
 
+            # If the conversation changed, write out the old buffer first
+            if self._pending and (session_id, user_id) != (self._session_id, self._user_id):
+                self.flush()
+            self._session_id = session_id
+            self._user_id = user_id
+
             # Get the latest message
             if event.agent.messages:
                 msg = event.agent.messages[-1]
@@ -108,18 +178,33 @@ class MemoryHook(HookProvider):
                 elif isinstance(content, dict):
                     content = content.get("text", str(content))
 
-                # Save to memory
-                memory_client.create_event(
-                    memory_id=MEMORY_ID,
-                    actor_id=user_id,
-                    session_id=session_id,
-                    messages=[(str(content), role)],
-                )
-                print(f"Saved message to memory: {role}")
+                self._pending.append((str(content), role))
+                if len(self._pending) >= self.FLUSH_THRESHOLD:
+                    self.flush()
 
         except Exception as e:
             print(f"Error saving to memory: {e}")
 
+    def flush(self):
+        """
+        Write all buffered messages to memory in one create_event call.
+        """
+        if not self._pending or not memory_client or not MEMORY_ID:
+            return
+
+        try:
+            messages = self._pending
+            self._pending = []
+            memory_client.create_event(
+                memory_id=MEMORY_ID,
+                actor_id=self._user_id or "default_user",
+                session_id=self._session_id or "default",
+                messages=messages,
+            )
+            print(f"Saved {len(messages)} messages to memory")
+        except Exception as e:
+            print(f"Error flushing memory: {e}")
+
     def register_hooks(self, registry: HookRegistry):
         """Register the memory hooks with the agent."""
         registry.add_callback(AgentInitializedEvent, self.on_agent_initialized)
@@ -156,7 +241,8 @@ def get_current_context() -> str:
 
 # Create the Strands agent (memory hooks disabled for now until MEMORY_ID is configured)
 # To enable memory, set MEMORY_ID environment variable to the deployed Memory resource ID
-hooks = []  # [MemoryHook()] if MEMORY_ID else []
+memory_hook = MemoryHook()
+hooks = []  # [memory_hook] if MEMORY_ID else []
 
 agent = Agent(
     model="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
@@ -178,6 +264,21 @@ Be friendly and reference past conversations when relevant.""",
 )
 
 
+def _extract_text(message):
+    """Extract the response text from an agent result message.
+
+    Hot path for every response, so the shape checks use type() rather
+    than isinstance.
+    """
+    if type(message) is dict and "content" in message:
+        content = message["content"]
+        if type(content) is list and content:
+            first = content[0]
+            if type(first) is dict:
+                return first.get("text", str(content))
+    return message
+
+
 @app.entrypoint
 def invoke(payload, context):
     """
@@ -190,29 +291,50 @@ def invoke(payload, context):
     Returns:
         The agent's response
     """
-    prompt = payload.get("prompt", "Hello!")
+    prompt = payload.get("prompt") or _DEFAULT_PROMPT
     user_id = payload.get("user_id", "default_user")
 
-    # Update agent state with session and user info
-    if hasattr(context, "session_id"):
-        agent.state["session_id"] = context.session_id
-    agent.state["user_id"] = user_id
+    # Update agent state with session and user info, skipping writes when
+    # nothing changed so warm containers serving one session avoid the
+    # state-observer machinery
+    session_id = getattr(context, "session_id", None)
+    if session_id and agent.state.get("session_id") != session_id:
+        agent.state["session_id"] = session_id
+    if agent.state.get("user_id") != user_id:
+        agent.state["user_id"] = user_id
 
     print(f"Processing prompt for user: {user_id}")
     print(f"Session ID: {agent.state.get('session_id')}")
 
-    # Invoke the agent
-    result = agent(prompt)
+    # Serve repeated prompts for this conversation from the cache
+    cache_key = (user_id, agent.state.get("session_id"), prompt.strip().lower())
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return {"result": cached}
 
-    # Extract response text
-    response_text = result.message
-    if isinstance(response_text, dict) and "content" in response_text:
-        content = response_text["content"]
-        if isinstance(content, list) and len(content) > 0:
-            response_text = content[0].get("text", str(content))
+    # Invoke the agent, flushing any buffered memory writes at end of turn
+    try:
+        result = agent(prompt)
+    finally:
+        memory_hook.flush()
+
+    # Extract the response text
+    response_text = _extract_text(result.message)
+
+    if isinstance(response_text, str):
+        _cache_put(cache_key, response_text)
 
     return {"result": response_text}
 
 
+# Opt-in warm-up: pay the first-invocation costs (Bedrock TLS, model
+# handshake) during container init instead of on the first user request
+if os.getenv("AGENTCORE_WARMUP") == "1":
+    try:
+        agent("warmup")
+    except Exception as e:
+        print(f"Agent warm-up failed (non-fatal): {e}")
+
+
 if __name__ == "__main__":
     app.run()
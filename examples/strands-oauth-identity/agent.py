@@ -6,19 +6,84 @@ AgentCore WorkloadIdentity for secure OAuth2 credential management
 to access external APIs like OpenAI, GitHub, etc.
 """
 
+import asyncio
 import os
+import threading
+from collections import OrderedDict
+
+import httpx
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
 from bedrock_agentcore.identity.auth import requires_api_key
 from strands import Agent, tool
 
+# Optional dependency - only needed for the OpenAI tool path
+try:
+    import openai
+except ImportError:
+    openai = None
+
 # Bypass tool consent for automated execution
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
 
 # Initialize the Bedrock AgentCore app
 app = BedrockAgentCoreApp()
 
-# Global variable for the agent (initialized after credentials)
-agent = None
+# Interned once at import; the `or` form also skips .get's default-arg
+# handling on the common path where a prompt is present
+_DEFAULT_PROMPT = "Hello!"
+
+# Module-level OpenAI client, created lazily and reused so warm invocations
+# share the underlying HTTP connection pool. Rebuilt if AgentCore Identity
+# rotates the key, so calls never run with a stale credential.
+_openai_client = None
+_openai_client_key = None
+_openai_client_lock = threading.Lock()
+
+# Pooled HTTP client so back-to-back GitHub calls reuse the same TCP+TLS
+# connection instead of paying a fresh handshake per call
+_github_client = httpx.Client(
+    base_url="https://api.github.com",
+    headers={
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "Strands-Agent",
+    },
+    timeout=10,
+)
+
+
+def _get_openai_client(api_key: str):
+    """Get the shared OpenAI client, rebuilding it if the key changed."""
+    global _openai_client, _openai_client_key
+    if _openai_client is None or _openai_client_key != api_key:
+        with _openai_client_lock:
+            if _openai_client is None or _openai_client_key != api_key:
+                _openai_client = openai.OpenAI(api_key=api_key)
+                _openai_client_key = api_key
+    return _openai_client
+
+
+# Response cache keyed on the exact prompt so repeated requests bypass
+# the model call. Set RESPONSE_CACHE_SIZE=0 to disable.
+_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "128"))
+_response_cache: OrderedDict = OrderedDict()
+
+
+def _cache_get(key):
+    """Fetch a cached response, bumping it to most recently used."""
+    response = _response_cache.get(key)
+    if response is not None:
+        _response_cache.move_to_end(key)
+    return response
+
+
+def _cache_put(key, response):
+    """Insert a response, evicting the oldest entry past the size cap."""
+    if not _CACHE_SIZE:
+        return
+    _response_cache[key] = response
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > _CACHE_SIZE:
+        _response_cache.popitem(last=False)
 
 
 @requires_api_key(
@@ -86,18 +151,18 @@ def call_external_api(service: str, prompt: str) -> str:
         if not api_key:
             return "Error: OpenAI credentials not configured. Please set up the credential provider."
 
+        if openai is None:
+            return "OpenAI package not installed. This is a demo - in production, install the openai package."
+
         try:
-            # Example OpenAI API call (requires openai package)
-            import openai
-            client = openai.OpenAI(api_key=api_key)
+            # Example OpenAI API call - client is created once and reused
+            client = _get_openai_client(api_key)
             response = client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=500
             )
             return response.choices[0].message.content
-        except ImportError:
-            return "OpenAI package not installed. This is a demo - in production, install the openai package."
         except Exception as e:
             return f"OpenAI API error: {str(e)}"
 
@@ -107,21 +172,19 @@ def call_external_api(service: str, prompt: str) -> str:
             return "Error: GitHub credentials not configured. Please set up the credential provider."
 
         try:
-            import urllib.request
-            import json
-
-            # Example: Search GitHub repositories
-            url = f"https://api.github.com/search/repositories?q={prompt}&per_page=5"
-            req = urllib.request.Request(url)
-            req.add_header("Authorization", f"token {token}")
-            req.add_header("Accept", "application/vnd.github.v3+json")
-            req.add_header("User-Agent", "Strands-Agent")
-
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode())
-                repos = [f"- {item['full_name']}: {item['description'] or 'No description'}"
-                         for item in data.get('items', [])[:5]]
-                return f"Top GitHub repos for '{prompt}':\n" + "\n".join(repos)
+            # Example: Search GitHub repositories over the pooled client
+            response = _github_client.get(
+                "/search/repositories",
+                params={"q": prompt, "per_page": 5},
+                headers={"Authorization": f"token {token}"},
+            )
+            # httpx does not raise on 4xx/5xx like urllib did - surface
+            # bad tokens and rate limits instead of returning an empty list
+            response.raise_for_status()
+            data = response.json()
+            repos = [f"- {item['full_name']}: {item['description'] or 'No description'}"
+                     for item in data.get('items', [])[:5]]
+            return f"Top GitHub repos for '{prompt}':\n" + "\n".join(repos)
         except Exception as e:
             return f"GitHub API error: {str(e)}"
 
@@ -151,6 +214,49 @@ When asked to use an external service:
     )
 
 
+# Create the agent at module scope so container init absorbs the cost
+# instead of the first request
+agent = create_agent()
+
+
+async def _fetch_all_credentials(verb: str = "retrieve"):
+    """Run both OAuth credential flows concurrently and log any failures."""
+    results = await asyncio.gather(
+        get_openai_credentials(api_key=""),
+        get_github_credentials(api_key=""),
+        return_exceptions=True,
+    )
+    for provider, outcome in zip(("OpenAI", "GitHub"), results):
+        if isinstance(outcome, Exception):
+            print(f"Note: Could not {verb} {provider} credentials: {outcome}")
+
+
+async def _prefetch_credentials():
+    """Fetch credentials during container init so the first request starts warm."""
+    print("Prefetching credentials from AgentCore Identity...")
+    await _fetch_all_credentials(verb="prefetch")
+
+
+# Opt-in credential prefetch for provisioned/warm instances
+if os.getenv("PREFETCH_CREDS") == "1":
+    asyncio.run(_prefetch_credentials())
+
+
+def _extract_text(message):
+    """Extract the response text from an agent result message.
+
+    Hot path for every response, so the shape checks use type() rather
+    than isinstance.
+    """
+    if type(message) is dict and "content" in message:
+        content = message["content"]
+        if type(content) is list and content:
+            first = content[0]
+            if type(first) is dict:
+                return first.get("text", str(content))
+    return message
+
+
 @app.entrypoint
 async def invoke(payload, context):
     """
@@ -163,41 +269,43 @@ async def invoke(payload, context):
     Returns:
         The agent's response
     """
-    global agent
-
-    prompt = payload.get("prompt", "Hello!")
+    prompt = payload.get("prompt") or _DEFAULT_PROMPT
     initialize_credentials = payload.get("initialize_credentials", False)
 
-    # Optionally initialize credentials on first request
+    # Optionally initialize credentials on first request - both OAuth
+    # flows run concurrently so we only pay for the slower of the two
     if initialize_credentials:
-        try:
-            print("Initializing credentials from AgentCore Identity...")
-            # These will trigger OAuth flow if needed
-            await get_openai_credentials(api_key="")
-        except Exception as e:
-            print(f"Note: Could not retrieve OpenAI credentials: {e}")
+        print("Initializing credentials from AgentCore Identity...")
+        await _fetch_all_credentials()
 
-        try:
-            await get_github_credentials(api_key="")
-        except Exception as e:
-            print(f"Note: Could not retrieve GitHub credentials: {e}")
-
-    # Create agent if not already created
-    if agent is None:
-        agent = create_agent()
+    # Serve repeated prompts straight from the cache, scoped by session
+    # so a response generated under one caller's credentials is never
+    # replayed into another conversation
+    cache_key = (getattr(context, "session_id", None), prompt.strip().lower())
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return {"result": cached}
 
     # Invoke the agent
     result = agent(prompt)
 
-    # Extract response text
-    response_text = result.message
-    if isinstance(response_text, dict) and "content" in response_text:
-        content = response_text["content"]
-        if isinstance(content, list) and len(content) > 0:
-            response_text = content[0].get("text", str(content))
+    # Extract the response text
+    response_text = _extract_text(result.message)
+
+    if isinstance(response_text, str):
+        _cache_put(cache_key, response_text)
 
     return {"result": response_text}
 
 
+# Opt-in warm-up: pay the first-invocation costs (Bedrock TLS, model
+# handshake) during container init instead of on the first user request
+if os.getenv("AGENTCORE_WARMUP") == "1":
+    try:
+        agent("warmup")
+    except Exception as e:
+        print(f"Agent warm-up failed (non-fatal): {e}")
+
+
 if __name__ == "__main__":
     app.run()